@@ -1,17 +1,170 @@
-from typing import List, Dict
+import itertools
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List
 
 import dask.array as da
-
-from dask import delayed
+import numpy as np
+import psutil
 from vispy.color import Colormap
 
 from napari.types import LayerData
 from omero.cli import ProxyStringType
-from omero.gateway import BlitzGateway, ImageWrapper
+from omero.gateway import BlitzGateway, ImageWrapper, PixelsWrapper
 from omero.model import IObject
 
-from ..utils import parse_omero_url, timer, lookup_obj, PIXEL_TYPES
-from ..widgets import QGateWay
+from ..utils import (
+    get_pixel_dtype,
+    lookup_obj,
+    parse_omero_url,
+    read_plane,
+    timer,
+)
+from ..widgets import PixelsStorePool, QGateWay
+
+# fraction of available RAM all lazily-loaded images may use to cache planes
+PLANE_CACHE_FRACTION = 0.25
+# number of neighbouring Z planes to fetch in the background after a read
+PREFETCH_Z = 2
+
+
+class PlaneCache:
+    """Planes read from OMERO, evicting the least recently used first.
+
+    A single cache is shared by all lazily loaded images, so together they
+    stay within ``max_bytes``. Concurrent requests for a plane that is
+    still being fetched wait for that fetch rather than starting another.
+    Keys are tuples whose first item identifies the image, so that all its
+    planes can be dropped with ``discard``.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._planes: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self._pending: Dict[Hashable, threading.Event] = {}
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Whether ``key`` is cached or currently being fetched."""
+        with self._lock:
+            return key in self._planes or key in self._pending
+
+    def get(self, key: Hashable, fetch: Callable[[], np.ndarray]):
+        """Return the plane for ``key``, calling ``fetch`` if not cached."""
+        while True:
+            with self._lock:
+                plane = self._planes.get(key)
+                if plane is not None:
+                    self._planes.move_to_end(key)
+                    return plane
+                event = self._pending.get(key)
+                if event is None:
+                    event = self._pending[key] = threading.Event()
+                    break
+            # another thread is fetching this plane; check again when done
+            event.wait()
+
+        try:
+            plane = fetch()
+            with self._lock:
+                self._planes[key] = plane
+                self._nbytes += plane.nbytes
+                # always keep the newest plane, even if alone over budget
+                while self._nbytes > self.max_bytes and len(self._planes) > 1:
+                    _, old = self._planes.popitem(last=False)
+                    self._nbytes -= old.nbytes
+        finally:
+            with self._lock:
+                del self._pending[key]
+            event.set()
+        return plane
+
+    def discard(self, image_key: Hashable):
+        """Drop all cached planes of the image identified by ``image_key``."""
+        with self._lock:
+            for key in [k for k in self._planes if k[0] == image_key]:
+                self._nbytes -= self._planes.pop(key).nbytes
+
+
+plane_cache = PlaneCache(
+    int(psutil.virtual_memory().available * PLANE_CACHE_FRACTION)
+)
+
+
+class PlaneReader:
+    """Reads the planes of one image for ``get_data_lazy``.
+
+    Planes go through the shared ``plane_cache``. When a block is read on
+    its own, as when napari shows a single plane, the neighbouring Z planes
+    are fetched in the background so the Z-slider finds them cached.
+    """
+
+    _tokens = itertools.count()
+
+    def __init__(self, pixels: PixelsWrapper, dtype, shape, size_z: int):
+        # distinguishes the planes of each image in plane_cache
+        self.token = next(self._tokens)
+        # nothing can read this image's planes once the reader is gone
+        weakref.finalize(self, plane_cache.discard, self.token)
+        # the stores are closed once this reader (and its array) is discarded
+        self._stores = PixelsStorePool(pixels)
+        self._dtype = dtype
+        self._shape = shape
+        self._size_z = size_z
+        self._prefetcher = ThreadPoolExecutor(max_workers=2)
+        self._prefetching: List[Future] = []
+        self._lock = threading.Lock()
+        self._active = 0
+        self._started = 0
+
+    @timer
+    def _fetch_plane(self, z, c, t):
+        with self._stores.store() as ps:
+            return read_plane(ps, (z, c, t), self._dtype, self._shape)
+
+    def get_plane(self, z, c, t):
+        return plane_cache.get(
+            (self.token, z, c, t), lambda: self._fetch_plane(z, c, t)
+        )
+
+    def read_block(self, block_info=None):
+        # each block is a single plane, so chunk-location gives its index
+        t, c, z = block_info[None]["chunk-location"][:3]
+        with self._lock:
+            self._active += 1
+            self._started += 1
+            started = self._started
+            alone = self._active == 1
+        try:
+            plane = self.get_plane(z, c, t)
+        finally:
+            with self._lock:
+                self._active -= 1
+                # no other block of this image was read at the same time
+                alone = alone and self._started == started
+        if alone:
+            self._prefetch(z, c, t)
+        return plane[np.newaxis, np.newaxis, np.newaxis]
+
+    def _prefetch(self, z, c, t):
+        neighbours = [
+            _z
+            for dz in range(1, PREFETCH_Z + 1)
+            for _z in (z + dz, z - dz)
+            if 0 <= _z < self._size_z
+            and (self.token, _z, c, t) not in plane_cache
+        ]
+        with self._lock:
+            # planes queued for an earlier position are no longer wanted
+            for future in self._prefetching:
+                future.cancel()
+            self._prefetching = [
+                self._prefetcher.submit(self.get_plane, _z, c, t)
+                for _z in neighbours
+            ]
 
 
 @timer
@@ -75,21 +228,20 @@ def load_image_wrapper(image: ImageWrapper) -> List[LayerData]:
 
 def get_omero_metadata(image: ImageWrapper) -> Dict:
     """Get metadata from OMERO as a Dict to pass to napari."""
-    channels = image.getChannels()
-
-    colors = []
-    for ch in channels:
-        # use current rendering settings from OMERO
-        color = ch.getColor().getRGB()
-        color = [r / 256 for r in color]
-        colors.append(Colormap([[0, 0, 0], color]))
-
-    contrast_limits = [
-        [ch.getWindowStart(), ch.getWindowEnd()] for ch in channels
+    # read each channel's rendering settings from OMERO in a single pass
+    channels = [
+        (
+            ch.getColor().getRGB(),
+            [ch.getWindowStart(), ch.getWindowEnd()],
+            ch.isActive(),
+            ch.getLabel(),
+        )
+        for ch in image.getChannels()
     ]
+    rgbs, contrast_limits, visibles, names = map(list, zip(*channels))
 
-    visibles = [ch.isActive() for ch in channels]
-    names = [ch.getLabel() for ch in channels]
+    rgbs = np.asarray(rgbs, dtype=np.float32) / 255
+    colors = [Colormap([[0, 0, 0], rgb]) for rgb in rgbs.tolist()]
 
     scale = None
     # Setting z-scale causes issues with Z-slider.
@@ -115,20 +267,14 @@ def get_data_lazy(image: ImageWrapper) -> da.Array:
     """Get 5D dask array, with delayed reading from OMERO image."""
     nt, nc, nz, ny, nx = [getattr(image, f'getSize{x}')() for x in 'TCZYX']
     pixels = image.getPrimaryPixels()
-    dtype = PIXEL_TYPES.get(pixels.getPixelsType().value, None)
-    get_plane = delayed(timer(lambda idx: pixels.getPlane(*idx)))
-
-    def get_lazy_plane(zct):
-        return da.from_delayed(get_plane(zct), shape=(ny, nx), dtype=dtype)
+    dtype = get_pixel_dtype(pixels)
+    reader = PlaneReader(pixels, dtype, (ny, nx), nz)
 
     # 5D stack: TCZXY
-    t_stacks = []
-    for t in range(nt):
-        c_stacks = []
-        for c in range(nc):
-            z_stack = []
-            for z in range(nz):
-                z_stack.append(get_lazy_plane((z, c, t)))
-            c_stacks.append(da.stack(z_stack))
-        t_stacks.append(da.stack(c_stacks))
-    return da.stack(t_stacks)
+    return da.map_blocks(
+        reader.read_block,
+        name=f"omero-pixels-{pixels.getId()}-{reader.token}",
+        chunks=((1,) * nt, (1,) * nc, (1,) * nz, (ny,), (nx,)),
+        dtype=dtype,
+        meta=np.empty((0, 0, 0, 0, 0), dtype=dtype),
+    )
@@ -1,5 +1,6 @@
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 
 import numpy
@@ -11,7 +12,7 @@ from napari.layers.labels.labels import Labels as labels_layer
 from napari.layers.points.points import Points as points_layer
 from napari.layers.shapes.shapes import Shapes as shapes_layer
 from omero.cli import CLI, BaseControl, ProxyStringType
-from omero.gateway import BlitzGateway, PixelsWrapper
+from omero.gateway import BlitzGateway
 from omero.model import (
     EllipseI,
     ImageI,
@@ -24,12 +25,20 @@ from omero.model import (
 )
 from omero.rtypes import rdouble, rint, rstring
 
-from ..utils import lookup_obj, obj_to_proxy_string
+from ..utils import (
+    get_pixel_dtype,
+    lookup_obj,
+    obj_to_proxy_string,
+    read_plane,
+)
 
 HELP = "Connect OMERO to the napari image viewer"
 
 VIEW_HELP = "Usage: omero napari view Image:1"
 
+# number of planes to download concurrently when loading eagerly
+MAX_WORKERS = 8
+
 
 def gateway_required(func):
     """
@@ -94,8 +103,9 @@ class NapariControl(BaseControl):
 
                 n = time.time()
                 viewer.open(obj_to_proxy_string(args.object), plugin="omero")
-                set_dims_defaults(viewer, img)
-                set_dims_labels(viewer, img)
+                size_t, size_z = img.getSizeT(), img.getSizeZ()
+                set_dims_defaults(viewer, img, size_t, size_z)
+                set_dims_labels(viewer)
                 print(f"time to load_omero_image(): {time.time() - n:.4f} s")
 
                 # add 'conn' and 'omero_image' to the viewer console
@@ -133,48 +143,61 @@ def get_data(img, c=0):
     """
     size_z = img.getSizeZ()
     size_t = img.getSizeT()
-    # get all planes we need in a single generator
+    size_y = img.getSizeY()
+    size_x = img.getSizeX()
     zct_list = [(z, c, t) for t in range(size_t) for z in range(size_z)]
     pixels = img.getPrimaryPixels()
-    plane_gen = pixels.getPlanes(zct_list)
+    dtype = get_pixel_dtype(pixels)
+    # fill a preallocated array rather than stacking lists of planes,
+    # which would copy all pixel data again
+    out = numpy.empty((size_t, size_z, size_y, size_x), dtype=dtype)
+
+    def fetch(zcts):
+        # each worker reads its share of planes through its own
+        # RawPixelsStore, so planes can be requested concurrently
+        ps = pixels._prepareRawPixelsStore()
+        try:
+            for z, _, t in zcts:
+                print("plane c:%s, t:%s, z:%s" % (c, t, z))
+                plane = out[t, z]
+                read_plane(ps, (z, c, t), dtype, plane.shape, out=plane)
+        finally:
+            ps.close()
 
-    t_stacks = []
-    for t in range(size_t):
-        z_stack = []
-        for z in range(size_z):
-            print("plane c:%s, t:%s, z:%s" % (c, t, z))
-            z_stack.append(next(plane_gen))
-        t_stacks.append(numpy.array(z_stack))
-    return numpy.array(t_stacks)
+    workers = min(MAX_WORKERS, len(zct_list))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        shares = [zct_list[i::workers] for i in range(workers)]
+        # consume the results so errors from the workers are raised here
+        list(executor.map(fetch, shares))
+    return out
 
 
-def set_dims_labels(viewer, image):
+def set_dims_labels(viewer):
     """
     Set labels on napari viewer dims, based on
     dimensions of OMERO image
 
     :param  viewer:     napari viewer instance
-    :param  image:      omero.gateway.ImageWrapper
     """
     # dims (t, z, y, x) for 5D image
-    dims = "TZ"
-
-    for idx, label in enumerate(dims):
-        viewer.dims.set_axis_label(idx, label)
+    viewer.dims.set_axis_label(0, "T")
+    viewer.dims.set_axis_label(1, "Z")
 
 
-def set_dims_defaults(viewer, image):
+def set_dims_defaults(viewer, image, size_t, size_z):
     """
     Set Z/T slider index on napari viewer, according
     to default Z/T indecies of the OMERO image
 
     :param  viewer:     napari viewer instance
     :param  image:      omero.gateway.ImageWrapper
+    :param  size_t:     int, number of timepoints in image
+    :param  size_z:     int, number of Z sections in image
     """
     # dims (t, z, y, x) for 5D image
-    if image.getSizeT() > 1:
+    if size_t > 1:
         viewer.dims.set_point(0, image.getDefaultT())
-    if image.getSizeZ() > 1:
+    if size_z > 1:
         viewer.dims.set_point(1, image.getDefaultZ())
 
 
@@ -186,12 +209,20 @@ def save_rois(viewer, image):
     """
     conn = image._conn
 
+    rois = []
     for layer in viewer.layers:
         if type(layer) == points_layer:
-            for p in layer.data:
-                point = create_omero_point(p)
-                roi = create_roi(conn, image.id, [point])
-                print("Created ROI: %s" % roi.id.val)
+            if len(layer.data) == 0:
+                continue
+            # extract each axis for all points at once
+            coords = numpy.asarray(layer.data)
+            xs = coords[:, -1].tolist()
+            ys = coords[:, -2].tolist()
+            zs = coords[:, 1].astype(int).tolist()
+            ts = coords[:, 0].astype(int).tolist()
+            for x, y, z, t in zip(xs, ys, zs, ts):
+                point = make_point(x, y, z, t)
+                rois.append(make_roi(image.id, [point]))
         elif type(layer) == shapes_layer:
             if len(layer.data) == 0 or len(layer.shape_type) == 0:
                 continue
@@ -203,11 +234,17 @@ def save_rois(viewer, image):
             for shape_type, data in zip(shape_types, layer.data):
                 shape = create_omero_shape(shape_type, data)
                 if shape is not None:
-                    roi = create_roi(conn, image.id, [shape])
-                    print("Created ROI: %s" % roi.id.val)
+                    rois.append(make_roi(image.id, [shape]))
         elif type(layer) == labels_layer:
             print("Saving Labels not supported")
 
+    if not rois:
+        return
+    # save all ROIs in a single call rather than one round-trip each
+    updateService = conn.getUpdateService()
+    for roi in updateService.saveAndReturnArray(rois, conn.SERVICE_OPTS):
+        print("Created ROI: %s" % roi.id.val)
+
 
 def get_x(coordinate):
     return coordinate[-1]
@@ -225,12 +262,12 @@ def get_z(coordinate):
     return coordinate[1]
 
 
-def create_omero_point(data):
+def make_point(x, y, z, t):
     point = PointI()
-    point.x = rdouble(get_x(data))
-    point.y = rdouble(get_y(data))
-    point.theZ = rint(get_z(data))
-    point.theT = rint(get_t(data))
+    point.x = rdouble(x)
+    point.y = rdouble(y)
+    point.theZ = rint(z)
+    point.theT = rint(t)
     return point
 
 
@@ -250,7 +287,10 @@ def create_omero_shape(shape_type, data):
     elif shape_type == "path" or shape_type == "polygon":
         shape = PolylineI() if shape_type == "path" else PolygonI()
         # points = "10,20, 50,150, 200,200, 250,75"
-        points = [f"{get_x(d)},{get_y(d)}" for d in data]
+        coords = numpy.asarray(data)
+        xs = coords[:, -1].tolist()
+        ys = coords[:, -2].tolist()
+        points = [f"{x},{y}" for x, y in zip(xs, ys)]
         shape.points = rstring(", ".join(points))
     elif shape_type == "rectangle" or shape_type == "ellipse":
         # corners go anti-clockwise starting top-left
@@ -294,33 +334,9 @@ def create_omero_shape(shape_type, data):
     return shape
 
 
-def create_roi(conn, img_id, shapes):
-    updateService = conn.getUpdateService()
+def make_roi(img_id, shapes):
     roi = RoiI()
     roi.setImage(ImageI(img_id, False))
     for shape in shapes:
         roi.addShape(shape)
-    return updateService.saveAndReturnObject(roi)
-
-
-class NonCachedPixelsWrapper(PixelsWrapper):
-    """Extend gateway.PixelWrapper to override _prepareRawPixelsStore."""
-
-    def _prepareRawPixelsStore(self):
-        """
-        Creates RawPixelsStore and sets the id etc
-
-        This overrides the superclass behaviour to make sure that
-        we don't re-use RawPixelStore in multiple processes since
-        the Store may be closed in 1 process while still needed elsewhere.
-        This is needed when napari requests may planes simultaneously,
-        e.g. when switching to 3D view.
-        """
-        ps = self._conn.c.sf.createRawPixelsStore()
-        ps.setPixelsId(self._obj.id.val, True, self._conn.SERVICE_OPTS)
-        return ps
-
-
-omero.gateway.PixelsWrapper = NonCachedPixelsWrapper
-# Update the BlitzGateway to use our NonCachedPixelsWrapper
-omero.gateway.refreshWrappers()
+    return roi
@@ -2,11 +2,11 @@ import functools
 import logging
 import re
 import time
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import numpy as np
 from omero.cli import ProxyStringType
-from omero.gateway import BlitzGateway, BlitzObjectWrapper
+from omero.gateway import BlitzGateway, BlitzObjectWrapper, PixelsWrapper
 from omero.model import IObject
 from omero.model import enums as omero_enums
 
@@ -23,6 +23,31 @@ PIXEL_TYPES = {
     omero_enums.PixelsTypedouble: np.float64,
 }
 
+
+def get_pixel_dtype(pixels: PixelsWrapper) -> Optional[type]:
+    """Return the numpy dtype matching the pixel type of ``pixels``."""
+    return PIXEL_TYPES.get(pixels.getPixelsType().value)
+
+
+def read_plane(
+    store, zct: Tuple[int, int, int], dtype, shape, out=None
+) -> np.ndarray:
+    """Read one plane from a RawPixelsStore as a native-endian array.
+
+    OMERO sends pixel data big-endian. If ``out`` is given the plane is
+    decoded straight into it, otherwise a new read-only array is returned.
+    """
+    raw = store.getPlane(*zct)
+    raw_dtype = np.dtype(dtype).newbyteorder(">")
+    plane = np.frombuffer(raw, dtype=raw_dtype).reshape(shape)
+    if out is not None:
+        out[...] = plane
+        return out
+    plane = plane.astype(dtype, copy=False)
+    plane.flags.writeable = False
+    return plane
+
+
 PROXIES = (
     ProxyStringType("Image"),
     ProxyStringType("Dataset"),
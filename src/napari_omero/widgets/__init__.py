@@ -1,6 +1,6 @@
 from .main import OMEROWidget
-from .gateway import QGateWay
+from .gateway import PixelsStorePool, QGateWay
 from .login import LoginForm
 
 
-__all__ = ["OMEROWidget", "QGateWay", "LoginForm"]
+__all__ = ["OMEROWidget", "QGateWay", "LoginForm", "PixelsStorePool"]
@@ -1,4 +1,7 @@
 import atexit
+import threading
+import weakref
+from contextlib import contextmanager
 from typing import Callable, Optional, Tuple, Generator
 
 from napari.qt.threading import WorkerBase, create_worker
@@ -68,6 +71,7 @@ class QGateWay(QObject):
 
     def close(self, hard=False):
         if self.isConnected():
+            PixelsStorePool.close_all(self.conn)
             self.conn.close(hard=hard)
             try:
                 self.disconnected.emit()
@@ -191,6 +195,70 @@ class NonCachedPixelsWrapper(PixelsWrapper):
         return ps
 
 
+def _close_stores(stores: list):
+    while stores:
+        try:
+            stores.pop().close()
+        except Exception:
+            pass
+
+
+class PixelsStorePool:
+    """RawPixelsStores for one Pixels, each used by one thread at a time.
+
+    Stores are created on demand and reused between reads. ``close()``
+    closes the idle stores and any borrowed store once it is returned. It
+    also runs when the pool is garbage collected, or when ``QGateWay``
+    closes the pool's connection.
+    """
+
+    _pools: "weakref.WeakSet[PixelsStorePool]" = weakref.WeakSet()
+
+    def __init__(self, pixels: PixelsWrapper):
+        self.conn = pixels._conn
+        self._pixels = pixels
+        self._idle: list = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._finalizer = weakref.finalize(self, _close_stores, self._idle)
+        PixelsStorePool._pools.add(self)
+
+    @contextmanager
+    def store(self):
+        """Borrow a store for the duration of the ``with`` block."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("PixelsStorePool is closed")
+            ps = self._idle.pop() if self._idle else None
+        if ps is None:
+            ps = self._pixels._prepareRawPixelsStore()
+        try:
+            with self._lock:
+                # the pool may have been closed while the store was created
+                if self._closed:
+                    raise RuntimeError("PixelsStorePool is closed")
+            yield ps
+        finally:
+            with self._lock:
+                closed = self._closed
+                if not closed:
+                    self._idle.append(ps)
+            if closed:
+                _close_stores([ps])
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        self._finalizer()
+
+    @classmethod
+    def close_all(cls, conn: BlitzGateway):
+        """Close the stores of every pool opened on ``conn``."""
+        for pool in list(cls._pools):
+            if pool.conn is conn:
+                pool.close()
+
+
 omero.gateway.PixelsWrapper = NonCachedPixelsWrapper
 # Update the BlitzGateway to use our NonCachedPixelsWrapper
 omero.gateway.refreshWrappers()
@@ -0,0 +1,84 @@
+"""Stand-ins for the OMERO gateway objects the loaders read from."""
+from types import SimpleNamespace
+
+import numpy as np
+from omero.model import enums as omero_enums
+
+SIZES = {'T': 2, 'C': 3, 'Z': 4, 'Y': 5, 'X': 6}
+
+
+def plane_value(z, c, t):
+    return z * 100 + c * 10 + t
+
+
+class FakeStore:
+    def __init__(self, sizes):
+        self._shape = (sizes['Y'], sizes['X'])
+        self.reads = []
+        self.closed = False
+
+    def getPlane(self, z, c, t):
+        assert not self.closed
+        self.reads.append((z, c, t))
+        value = plane_value(z, c, t)
+        # OMERO sends pixel data big-endian
+        return np.full(self._shape, value, dtype='>u2').tobytes()
+
+    def close(self):
+        self.closed = True
+
+
+class FakePixels:
+    def __init__(self, sizes=SIZES, conn=None):
+        self._sizes = sizes
+        self._conn = conn
+        self.stores = []
+
+    def getId(self):
+        return 1
+
+    def getPixelsType(self):
+        return SimpleNamespace(value=omero_enums.PixelsTypeuint16)
+
+    def _prepareRawPixelsStore(self):
+        store = FakeStore(self._sizes)
+        self.stores.append(store)
+        return store
+
+
+class FakeChannel:
+    def __init__(self, rgb):
+        self._rgb = rgb
+
+    def getColor(self):
+        return SimpleNamespace(getRGB=lambda: self._rgb)
+
+    def getWindowStart(self):
+        return 0
+
+    def getWindowEnd(self):
+        return 255
+
+    def isActive(self):
+        return True
+
+    def getLabel(self):
+        return str(self._rgb)
+
+
+class FakeImage:
+    def __init__(self, sizes=SIZES, channels=()):
+        self._sizes = sizes
+        self._channels = list(channels)
+        self.pixels = FakePixels(sizes)
+
+    def __getattr__(self, name):
+        if name.startswith('getSize'):
+            return lambda: self._sizes[name[-1]]
+        raise AttributeError(name)
+
+    def getPrimaryPixels(self):
+        return self.pixels
+
+    def getChannels(self):
+        return self._channels
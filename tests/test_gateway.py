@@ -0,0 +1,80 @@
+import gc
+
+import pytest
+
+from napari_omero.widgets.gateway import PixelsStorePool
+
+from fakes import FakePixels
+
+
+def test_pool_reuses_returned_store():
+    pixels = FakePixels()
+    pool = PixelsStorePool(pixels)
+    with pool.store() as first:
+        pass
+    with pool.store() as second:
+        assert second is first
+    assert len(pixels.stores) == 1
+
+
+def test_pool_lends_each_store_to_one_borrower():
+    pixels = FakePixels()
+    pool = PixelsStorePool(pixels)
+    with pool.store() as first, pool.store() as second:
+        assert first is not second
+    assert len(pixels.stores) == 2
+
+
+def test_pool_close():
+    pixels = FakePixels()
+    pool = PixelsStorePool(pixels)
+    with pool.store() as borrowed:
+        with pool.store() as idle:
+            pass
+        pool.close()
+        assert idle.closed
+        # a store in use is only closed once it is returned
+        assert not borrowed.closed
+    assert borrowed.closed
+    with pytest.raises(RuntimeError):
+        with pool.store():
+            pass
+
+
+def test_pool_closed_while_creating_store():
+    pixels = FakePixels()
+    pool = PixelsStorePool(pixels)
+    prepare = pixels._prepareRawPixelsStore
+
+    def close_then_prepare():
+        pool.close()
+        return prepare()
+
+    pixels._prepareRawPixelsStore = close_then_prepare
+    with pytest.raises(RuntimeError):
+        with pool.store():
+            pass
+    assert pixels.stores[0].closed
+
+
+def test_pool_closed_when_collected():
+    pixels = FakePixels()
+    pool = PixelsStorePool(pixels)
+    with pool.store():
+        pass
+    del pool
+    gc.collect()
+    assert pixels.stores[0].closed
+
+
+def test_close_all_only_closes_pools_of_conn():
+    conn, other_conn = object(), object()
+    pixels, other_pixels = FakePixels(conn=conn), FakePixels(conn=other_conn)
+    pool = PixelsStorePool(pixels)
+    other_pool = PixelsStorePool(other_pixels)
+    for p in (pool, other_pool):
+        with p.store():
+            pass
+    PixelsStorePool.close_all(conn)
+    assert pixels.stores[0].closed
+    assert not other_pixels.stores[0].closed
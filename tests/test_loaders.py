@@ -0,0 +1,219 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from napari_omero.plugins.loaders import (
+    PREFETCH_Z,
+    PlaneCache,
+    PlaneReader,
+    get_data_lazy,
+    get_omero_metadata,
+    plane_cache,
+)
+
+from fakes import SIZES, FakeChannel, FakeImage, FakePixels, plane_value
+
+
+def test_get_data_lazy_plane_order():
+    data = get_data_lazy(FakeImage())
+    assert data.shape == tuple(SIZES[x] for x in 'TCZYX')
+    assert data.dtype == np.uint16
+    assert len(data.dask.layers) == 1
+
+    for t, c, z in [(0, 0, 0), (1, 2, 3), (0, 1, 2), (1, 0, 3)]:
+        plane = data[t, c, z].compute()
+        assert plane.shape == (SIZES['Y'], SIZES['X'])
+        assert (plane == plane_value(z, c, t)).all()
+
+
+def test_get_omero_metadata_colors():
+    channels = [FakeChannel((255, 255, 255)), FakeChannel((255, 0, 0))]
+    meta = get_omero_metadata(FakeImage(channels=channels))
+    white, red = [cmap.colors.rgba[-1] for cmap in meta['colormap']]
+    np.testing.assert_allclose(white, [1, 1, 1, 1])
+    np.testing.assert_allclose(red, [1, 0, 0, 1])
+    assert meta['contrast_limits'] == [[0, 255], [0, 255]]
+    assert meta['visible'] == [True, True]
+
+
+def make_plane(value, nbytes=8):
+    return np.full(nbytes, value, dtype=np.uint8)
+
+
+def not_fetched():
+    raise AssertionError('plane should have been cached')
+
+
+def test_plane_cache_evicts_least_recently_used():
+    cache = PlaneCache(max_bytes=16)
+    cache.get((0, 1), lambda: make_plane(1))
+    cache.get((0, 2), lambda: make_plane(2))
+    # reading plane 1 again leaves plane 2 as the least recently used
+    assert cache.get((0, 1), not_fetched)[0] == 1
+    cache.get((0, 3), lambda: make_plane(3))
+
+    assert (0, 1) in cache
+    assert (0, 2) not in cache
+    assert (0, 3) in cache
+    assert cache._nbytes == 16
+
+
+def test_plane_cache_keeps_newest_plane_over_budget():
+    cache = PlaneCache(max_bytes=4)
+    cache.get((0, 1), lambda: make_plane(1))
+    assert (0, 1) in cache
+    cache.get((0, 2), lambda: make_plane(2))
+    assert (0, 1) not in cache
+    assert cache.get((0, 2), not_fetched)[0] == 2
+    assert cache._nbytes == 8
+
+
+def test_plane_cache_discard():
+    cache = PlaneCache(max_bytes=64)
+    cache.get((0, 1), lambda: make_plane(1))
+    cache.get((0, 2), lambda: make_plane(2))
+    cache.get((1, 1), lambda: make_plane(3))
+    cache.discard(0)
+    assert (0, 1) not in cache
+    assert (0, 2) not in cache
+    assert (1, 1) in cache
+    assert cache._nbytes == 8
+
+
+def test_plane_cache_fetches_pending_key_once():
+    cache = PlaneCache(max_bytes=64)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return make_plane(7)
+
+    results = []
+
+    def read():
+        results.append(cache.get((0, 0), fetch))
+
+    threads = [threading.Thread(target=read) for _ in range(2)]
+    threads[0].start()
+    assert started.wait(5)
+    # the plane being fetched counts as present, so prefetch skips it
+    assert (0, 0) in cache
+    threads[1].start()
+    # give the second thread time to block on the pending fetch
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 2
+    assert results[0] is results[1]
+
+
+def test_plane_cache_fetch_error_clears_pending():
+    cache = PlaneCache(max_bytes=64)
+
+    def fail():
+        raise RuntimeError('no plane')
+
+    with pytest.raises(RuntimeError):
+        cache.get((0, 0), fail)
+    assert (0, 0) not in cache
+    assert not cache._pending
+
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return make_plane(1)
+
+    cache.get((0, 0), fetch)
+    assert calls == [1]
+
+
+PREFETCH_SIZES = dict(SIZES, Z=8)
+
+
+def make_reader():
+    pixels = FakePixels(PREFETCH_SIZES)
+    shape = (PREFETCH_SIZES['Y'], PREFETCH_SIZES['X'])
+    reader = PlaneReader(pixels, np.uint16, shape, PREFETCH_SIZES['Z'])
+    return reader, pixels
+
+
+def read_block(reader, z, c=0, t=0):
+    return reader.read_block({None: {'chunk-location': (t, c, z, 0, 0)}})
+
+
+def wait_for_prefetch(reader):
+    for future in reader._prefetching:
+        future.result(5)
+
+
+def cached_z(reader, c=0, t=0):
+    return {
+        z
+        for z in range(PREFETCH_SIZES['Z'])
+        if (reader.token, z, c, t) in plane_cache
+    }
+
+
+def test_prefetch_neighbours_of_single_plane():
+    reader, _ = make_reader()
+    z = 3
+    assert read_block(reader, z)[0, 0, 0, 0, 0] == plane_value(z, 0, 0)
+    wait_for_prefetch(reader)
+    expected = set(range(z - PREFETCH_Z, z + PREFETCH_Z + 1))
+    assert cached_z(reader) == expected
+
+
+def test_prefetch_stops_at_edges():
+    reader, _ = make_reader()
+    read_block(reader, 0)
+    wait_for_prefetch(reader)
+    assert cached_z(reader) == set(range(PREFETCH_Z + 1))
+
+
+def test_prefetch_skips_cached_planes():
+    reader, pixels = make_reader()
+    reader.get_plane(4, 0, 0)
+    read_block(reader, 3)
+    wait_for_prefetch(reader)
+    assert len(reader._prefetching) == 2 * PREFETCH_Z - 1
+    reads = [zct for store in pixels.stores for zct in store.reads]
+    # every plane was downloaded exactly once
+    assert sorted(reads) == sorted(set(reads))
+
+
+def test_no_prefetch_while_other_blocks_are_read():
+    reader, _ = make_reader()
+    # pretend another block of this image is being read at the same time
+    reader._active = 1
+    read_block(reader, 3)
+    assert reader._prefetching == []
+    assert cached_z(reader) == {3}
+
+
+def test_prefetch_cancels_queued_planes_when_moving():
+    reader, _ = make_reader()
+    reader._prefetcher = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    # keep the only prefetch thread busy so neighbours stay queued
+    reader._prefetcher.submit(release.wait, 5)
+
+    read_block(reader, 3)
+    queued = list(reader._prefetching)
+    assert len(queued) == 2 * PREFETCH_Z
+
+    read_block(reader, 6)
+    assert all(future.cancelled() for future in queued)
+    release.set()
+    wait_for_prefetch(reader)
+    assert cached_z(reader) == {3, 4, 5, 6, 7}
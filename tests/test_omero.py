@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from napari.layers import Points, Shapes
+from omero.model import PointI, PolylineI
+from omero.rtypes import rlong
+
+from napari_omero.plugins.omero import MAX_WORKERS, get_data, save_rois
+
+from fakes import SIZES, FakeImage, plane_value
+
+
+@pytest.mark.parametrize('size_t, size_z', [(1, 3), (3, 5)])
+def test_get_data(size_t, size_z):
+    sizes = dict(SIZES, T=size_t, Z=size_z)
+    img = FakeImage(sizes)
+    c = 1
+    data = get_data(img, c)
+    assert data.shape == (size_t, size_z, sizes['Y'], sizes['X'])
+    assert data.dtype == np.uint16
+    for t in range(size_t):
+        for z in range(size_z):
+            assert (data[t, z] == plane_value(z, c, t)).all()
+
+    stores = img.pixels.stores
+    assert len(stores) == min(MAX_WORKERS, size_t * size_z)
+    assert all(store.closed for store in stores)
+    reads = sorted(zct for store in stores for zct in store.reads)
+    assert reads == sorted(
+        (z, c, t) for t in range(size_t) for z in range(size_z)
+    )
+
+
+class FakeUpdateService:
+    def __init__(self):
+        self.calls = []
+
+    def saveAndReturnArray(self, rois, ctx):
+        self.calls.append(rois)
+        for i, roi in enumerate(rois, 1):
+            roi.setId(rlong(i))
+        return rois
+
+
+def make_image():
+    update = FakeUpdateService()
+    conn = SimpleNamespace(
+        getUpdateService=lambda: update, SERVICE_OPTS=None
+    )
+    return SimpleNamespace(id=7, _conn=conn), update
+
+
+def test_save_rois_in_one_call():
+    # (t, z, y, x)
+    points = Points(np.array([[1, 2, 30.5, 40.5], [0, 3, 10.0, 20.0]]))
+    path = np.array([[2, 4, 10.0, 20.0], [2, 4, 30.0, 40.0]])
+    shapes = Shapes([path], shape_type='path')
+    viewer = SimpleNamespace(layers=[points, shapes])
+    image, update = make_image()
+
+    save_rois(viewer, image)
+
+    assert len(update.calls) == 1
+    rois = update.calls[0]
+    assert len(rois) == 3
+    assert all(roi.getImage().id.val == 7 for roi in rois)
+    first, second, line = [roi.copyShapes()[0] for roi in rois]
+    assert isinstance(first, PointI)
+    assert (first.x.val, first.y.val) == (40.5, 30.5)
+    assert (first.theZ.val, first.theT.val) == (2, 1)
+    assert (second.theZ.val, second.theT.val) == (3, 0)
+
+    assert isinstance(line, PolylineI)
+    assert line.points.val == "20.0,10.0, 40.0,30.0"
+    assert (line.theZ.val, line.theT.val) == (4, 2)
+
+
+def test_save_rois_without_layers():
+    image, update = make_image()
+    save_rois(SimpleNamespace(layers=[]), image)
+    assert update.calls == []